@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-import colorsys
-from typing import Tuple
+from functools import lru_cache
+
+import numpy as np
 
 
 _SRGB_TO_XYZ = (
@@ -17,6 +17,12 @@ _XYZ_TO_SRGB = (
 	(0.0556434, -0.2040259, 1.0572252),
 )
 
+_SRGB_TO_XYZ_NP = np.asarray(_SRGB_TO_XYZ, dtype=np.float64)
+_XYZ_TO_SRGB_NP = np.asarray(_XYZ_TO_SRGB, dtype=np.float64)
+
+# Размер кэшей конвертеров: слайдеры в UI дают небольшое число уникальных значений.
+_CACHE_SIZE = 4096
+
 
 def _clamp(value: float, min_value: float, max_value: float) -> float:
 	if value < min_value:
@@ -32,101 +38,236 @@ def _srgb_to_linear(c: float) -> float:
 	return ((c + 0.055) / 1.055) ** 2.4
 
 
-def _linear_to_srgb(c: float) -> float:
+# Линейные значения для всех 256 уровней 8-битного канала.
+_SRGB_LIN_LUT = tuple(_srgb_to_linear(k / 255.0) for k in range(256))
+_SRGB_LIN_LUT_NP = np.asarray(_SRGB_LIN_LUT, dtype=np.float64)
+
+# Две hex-цифры для каждого значения 8-битного канала.
+_HEX = tuple("%02X" % k for k in range(256))
+
+
+def _encode_srgb(c: float) -> float:
+	"""Обрезает линейное значение до 0..1 и применяет гамму sRGB."""
 	if c <= 0.0031308:
-		return 12.92 * c
+		return 12.92 * c if c > 0.0 else 0.0
+	if c > 1.0:
+		c = 1.0
 	return 1.055 * (c ** (1.0 / 2.4)) - 0.055
 
 
-def _dot3(m: Tuple[Tuple[float, float, float], ...], v: Tuple[float, float, float]) -> Tuple[float, float, float]:
-	a = m[0][0] * v[0] + m[0][1] * v[1] + m[0][2] * v[2]
-	b = m[1][0] * v[0] + m[1][1] * v[1] + m[1][2] * v[2]
-	c = m[2][0] * v[0] + m[2][1] * v[1] + m[2][2] * v[2]
-	return (a, b, c)
+def _to_byte(x: float) -> int:
+	"""Переводит значение 0..1 в 8-битный канал с насыщением на границах."""
+	if x <= 0.0:
+		return 0
+	if x >= 1.0:
+		return 255
+	return int(x * 255.0 + 0.5)
+
+
+def _dot3_batch(m: np.ndarray, v: np.ndarray) -> np.ndarray:
+	"""Умножает матрицу 3x3 на каждый вектор массива формы (..., 3) одним вызовом NumPy."""
+	return v @ m.T
 
 
-def _xyz100_to_srgb(X: float, Y: float, Z: float) -> Tuple[Tuple[float, float, float], bool]:
+def _hsv_deg(r: float, g: float, b: float) -> tuple[float, float, float]:
+	"""HSV (H в градусах, S/V в процентах) для каналов 0..1; порядок операций как в colorsys.rgb_to_hsv."""
+	maxc = max(r, g, b)
+	minc = min(r, g, b)
+	if minc == maxc:
+		return (0.0, 0.0, maxc * 100.0)
+	rangec = maxc - minc
+	rc = (maxc - r) / rangec
+	gc = (maxc - g) / rangec
+	bc = (maxc - b) / rangec
+	if r == maxc:
+		h = bc - gc
+	elif g == maxc:
+		h = 2.0 + rc - bc
+	else:
+		h = 4.0 + gc - rc
+	return ((h / 6.0) % 1.0 * 360.0, rangec / maxc * 100.0, maxc * 100.0)
+
+
+def _xyz100_to_srgb(X: float, Y: float, Z: float) -> tuple[tuple[float, float, float], bool]:
 	Xn = X / 100.0
 	Yn = Y / 100.0
 	Zn = Z / 100.0
-	r_lin, g_lin, b_lin = _dot3(_XYZ_TO_SRGB, (Xn, Yn, Zn))
-	clipped = False
-	if not (0.0 <= r_lin <= 1.0) or not (0.0 <= g_lin <= 1.0) or not (0.0 <= b_lin <= 1.0):
-		clipped = True
-	r_srgb = _linear_to_srgb(_clamp(r_lin, 0.0, 1.0))
-	g_srgb = _linear_to_srgb(_clamp(g_lin, 0.0, 1.0))
-	b_srgb = _linear_to_srgb(_clamp(b_lin, 0.0, 1.0))
-	return (r_srgb, g_srgb, b_srgb), clipped
+	(m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = _XYZ_TO_SRGB
+	r_lin = m00 * Xn + m01 * Yn + m02 * Zn
+	g_lin = m10 * Xn + m11 * Yn + m12 * Zn
+	b_lin = m20 * Xn + m21 * Yn + m22 * Zn
+	clipped = r_lin < 0.0 or r_lin > 1.0 or g_lin < 0.0 or g_lin > 1.0 or b_lin < 0.0 or b_lin > 1.0
+	return (_encode_srgb(r_lin), _encode_srgb(g_lin), _encode_srgb(b_lin)), clipped
 
 
-def rgb255_to_xyz100(r: int, g: int, b: int) -> Tuple[float, float, float]:
+@lru_cache(maxsize=_CACHE_SIZE)
+def rgb255_to_xyz100(r: int, g: int, b: int) -> tuple[float, float, float]:
 	"""Преобразует 8-битный sRGB в CIE XYZ, масштабированный к диапазону 0..100 (D65)."""
-	r = _clamp(r, 0, 255)
-	g = _clamp(g, 0, 255)
-	b = _clamp(b, 0, 255)
-	r_s = r / 255.0
-	g_s = g / 255.0
-	b_s = b / 255.0
-	r_lin = _srgb_to_linear(r_s)
-	g_lin = _srgb_to_linear(g_s)
-	b_lin = _srgb_to_linear(b_s)
-	X, Y, Z = _dot3(_SRGB_TO_XYZ, (r_lin, g_lin, b_lin))
+	# Каналы округляются до целого уровня, чтобы индексировать таблицу линейных значений.
+	r_lin = _SRGB_LIN_LUT[_clamp(round(r), 0, 255)]
+	g_lin = _SRGB_LIN_LUT[_clamp(round(g), 0, 255)]
+	b_lin = _SRGB_LIN_LUT[_clamp(round(b), 0, 255)]
+	(m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = _SRGB_TO_XYZ
+	X = m00 * r_lin + m01 * g_lin + m02 * b_lin
+	Y = m10 * r_lin + m11 * g_lin + m12 * b_lin
+	Z = m20 * r_lin + m21 * g_lin + m22 * b_lin
 	return (X * 100.0, Y * 100.0, Z * 100.0)
 
 
-def xyz100_to_rgb255(X: float, Y: float, Z: float) -> Tuple[Tuple[int, int, int], bool]:
+def xyz100_to_rgb255(X: float, Y: float, Z: float) -> tuple[tuple[int, int, int], bool]:
 	"""Преобразует XYZ (0..100, D65) в 8-битный sRGB. Возвращает (rgb, флаг_обрезки_значения)."""
 	(srgb, clipped) = _xyz100_to_srgb(X, Y, Z)
 	r_srgb, g_srgb, b_srgb = srgb
-	r8 = int(round(_clamp(r_srgb, 0.0, 1.0) * 255.0))
-	g8 = int(round(_clamp(g_srgb, 0.0, 1.0) * 255.0))
-	b8 = int(round(_clamp(b_srgb, 0.0, 1.0) * 255.0))
-	r8 = max(0, min(255, r8))
-	g8 = max(0, min(255, g8))
-	b8 = max(0, min(255, b8))
-	return (r8, g8, b8), clipped
+	return (_to_byte(r_srgb), _to_byte(g_srgb), _to_byte(b_srgb)), clipped
 
 
-def rgb255_to_hsv_deg(r: int, g: int, b: int) -> Tuple[float, float, float]:
-	r_s = _clamp(r, 0, 255) / 255.0
-	g_s = _clamp(g, 0, 255) / 255.0
-	b_s = _clamp(b, 0, 255) / 255.0
-	h, s, v = colorsys.rgb_to_hsv(r_s, g_s, b_s)  # h,s,v в диапазоне 0..1
-	return (h * 360.0, s * 100.0, v * 100.0)
+@lru_cache(maxsize=_CACHE_SIZE)
+def rgb255_to_hsv_deg(r: int, g: int, b: int) -> tuple[float, float, float]:
+	return _hsv_deg(_clamp(r, 0, 255) / 255.0, _clamp(g, 0, 255) / 255.0, _clamp(b, 0, 255) / 255.0)
 
 
-def hsv_deg_to_rgb255(h_deg: float, s_perc: float, v_perc: float) -> Tuple[int, int, int]:
-	h = (h_deg % 360.0) / 360.0
+def hsv_deg_to_rgb255(h_deg: float, s_perc: float, v_perc: float) -> tuple[int, int, int]:
+	h = (h_deg % 360.0) / 360.0 * 6.0  # номер сектора цветового круга с дробной частью
 	s = _clamp(s_perc, 0.0, 100.0) / 100.0
 	v = _clamp(v_perc, 0.0, 100.0) / 100.0
-	r_s, g_s, b_s = colorsys.hsv_to_rgb(h, s, v)
-	r8 = int(round(_clamp(r_s, 0.0, 1.0) * 255.0))
-	g8 = int(round(_clamp(g_s, 0.0, 1.0) * 255.0))
-	b8 = int(round(_clamp(b_s, 0.0, 1.0) * 255.0))
-	return max(0, min(255, r8)), max(0, min(255, g8)), max(0, min(255, b8))
+	i = int(h)
+	f = h - i
+	p = v * (1.0 - s)
+	q = v * (1.0 - s * f)
+	t = v * (1.0 - s * (1.0 - f))
+	r_s, g_s, b_s = ((v, t, p), (q, v, p), (p, v, t), (p, q, v), (t, p, v), (v, p, q))[i % 6]
+	return _to_byte(r_s), _to_byte(g_s), _to_byte(b_s)
+
+
+@lru_cache(maxsize=65536)
+def hsv_int_to_rgb255(h_deg: int, s_perc: int, v_perc: int) -> tuple[int, int, int]:
+	"""Кэшированный hsv_deg_to_rgb255 для целых H/S/V (шаг слайдеров HSV — 1° и 1%)."""
+	return hsv_deg_to_rgb255(float(h_deg), float(s_perc), float(v_perc))
+
+
+def xyz100_to_hsv_deg(X: float, Y: float, Z: float) -> tuple[tuple[float, float, float], bool]:
+	(srgb, clipped) = _xyz100_to_srgb(X, Y, Z)
+	r_s, g_s, b_s = srgb
+	return _hsv_deg(r_s, g_s, b_s), clipped
 
 
-def xyz100_to_hsv_deg(X: float, Y: float, Z: float) -> Tuple[Tuple[float, float, float], bool]:
+def xyz100_to_rgb_and_hsv(X: float, Y: float, Z: float) -> tuple[tuple[int, int, int], tuple[float, float, float], bool]:
+	"""Совмещает xyz100_to_rgb255 и xyz100_to_hsv_deg за один переход в sRGB. Возвращает (rgb, hsv, флаг_обрезки_значения)."""
 	(srgb, clipped) = _xyz100_to_srgb(X, Y, Z)
 	r_s, g_s, b_s = srgb
-	h, s, v = colorsys.rgb_to_hsv(r_s, g_s, b_s)
-	return (h * 360.0, s * 100.0, v * 100.0), clipped
+	return (_to_byte(r_s), _to_byte(g_s), _to_byte(b_s)), _hsv_deg(r_s, g_s, b_s), clipped
 
 
-def hsv_deg_to_xyz100(h_deg: float, s_perc: float, v_perc: float) -> Tuple[float, float, float]:
+def hsv_deg_to_xyz100(h_deg: float, s_perc: float, v_perc: float) -> tuple[float, float, float]:
 	r, g, b = hsv_deg_to_rgb255(h_deg, s_perc, v_perc)
 	return rgb255_to_xyz100(r, g, b)
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def rgb_to_hex(r: int, g: int, b: int) -> str:
-	return f"#{r:02X}{g:02X}{b:02X}"
+	return "#" + _HEX[_clamp(r, 0, 255)] + _HEX[_clamp(g, 0, 255)] + _HEX[_clamp(b, 0, 255)]
 
 
-def hex_to_rgb(hex_str: str) -> Tuple[int, int, int]:
+@lru_cache(maxsize=_CACHE_SIZE)
+def hex_to_rgb(hex_str: str) -> tuple[int, int, int]:
 	hs = hex_str.strip().lstrip('#')
 	if len(hs) != 6:
 		return (0, 0, 0)
-	r = int(hs[0:2], 16)
-	g = int(hs[2:4], 16)
-	b = int(hs[4:6], 16)
-	return (r, g, b)
+	rgb = bytes.fromhex(hs)
+	if len(rgb) != 3:  # bytes.fromhex пропускает пробелы между парами цифр
+		raise ValueError(f"invalid hex color: {hex_str!r}")
+	return (rgb[0], rgb[1], rgb[2])
+
+
+@lru_cache(maxsize=None)
+def _encode_rgb255_kernel():
+	"""Ядро numba для xyz100_to_rgb255_batch; компилируется при первом вызове, None без numba."""
+	try:
+		from numba import njit
+	except ImportError:  # numba необязательна: без неё работает реализация на чистом NumPy
+		return None
+
+	@njit(cache=True, nogil=True)
+	def kernel(lin, rgb, clipped):
+		# Один проход по пикселям (N, 3): обрезка, гамма sRGB и округление без временных массивов.
+		for i in range(lin.shape[0]):
+			out_of_gamut = False
+			for j in range(3):
+				c = lin[i, j]
+				if c < 0.0:
+					c = 0.0
+					out_of_gamut = True
+				elif c > 1.0:
+					c = 1.0
+					out_of_gamut = True
+				if c <= 0.0031308:
+					c = 12.92 * c
+				else:
+					c = 1.055 * c ** (1.0 / 2.4) - 0.055
+				rgb[i, j] = int(c * 255.0 + 0.5)
+			clipped[i] = out_of_gamut
+
+	return kernel
+
+
+def _to_byte_batch(c: np.ndarray) -> np.ndarray:
+	return (np.clip(c, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+
+def rgb255_to_xyz100_batch(rgb: np.ndarray) -> np.ndarray:
+	"""Пакетная версия rgb255_to_xyz100 для массивов формы (..., 3)."""
+	idx = np.clip(np.rint(np.asarray(rgb)), 0, 255).astype(np.intp)
+	lin = _SRGB_LIN_LUT_NP[idx]
+	return _dot3_batch(_SRGB_TO_XYZ_NP, lin) * 100.0
+
+
+def xyz100_to_rgb255_batch(xyz: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+	"""Пакетная версия xyz100_to_rgb255. Возвращает (rgb uint8 формы (..., 3), маска обрезки формы (...))."""
+	lin = _dot3_batch(_XYZ_TO_SRGB_NP, np.asarray(xyz, dtype=np.float64) / 100.0)
+	kernel = _encode_rgb255_kernel()
+	if kernel is not None:
+		flat = np.ascontiguousarray(lin).reshape(-1, 3)
+		rgb = np.empty(flat.shape, dtype=np.uint8)
+		clipped = np.empty(flat.shape[0], dtype=np.bool_)
+		kernel(flat, rgb, clipped)
+		return rgb.reshape(lin.shape), clipped.reshape(lin.shape[:-1])
+	clipped = np.any((lin < 0.0) | (lin > 1.0), axis=-1)
+	lin = np.clip(lin, 0.0, 1.0)
+	srgb = np.where(lin <= 0.0031308, 12.92 * lin, 1.055 * lin ** (1.0 / 2.4) - 0.055)
+	return _to_byte_batch(srgb), clipped
+
+
+def rgb255_to_hsv_deg_batch(rgb: np.ndarray) -> np.ndarray:
+	"""Пакетная версия rgb255_to_hsv_deg для массивов формы (..., 3); порядок операций как в _hsv_deg."""
+	c = np.clip(np.asarray(rgb, dtype=np.float64), 0.0, 255.0) / 255.0
+	r, g, b = c[..., 0], c[..., 1], c[..., 2]
+	maxc = c.max(axis=-1)
+	rangec = maxc - c.min(axis=-1)
+	gray = rangec == 0.0
+	rangec_safe = np.where(gray, 1.0, rangec)
+	rc = (maxc - r) / rangec_safe
+	gc = (maxc - g) / rangec_safe
+	bc = (maxc - b) / rangec_safe
+	h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+	h = np.where(gray, 0.0, (h / 6.0) % 1.0 * 360.0)
+	s = np.where(gray, 0.0, rangec / np.where(gray, 1.0, maxc) * 100.0)
+	return np.stack((h, s, maxc * 100.0), axis=-1)
+
+
+def hsv_deg_to_rgb255_batch(hsv: np.ndarray) -> np.ndarray:
+	"""Пакетная версия hsv_deg_to_rgb255 для массивов формы (..., 3)."""
+	c = np.asarray(hsv, dtype=np.float64)
+	h6 = (c[..., 0] % 360.0) / 360.0 * 6.0
+	s = np.clip(c[..., 1], 0.0, 100.0) / 100.0
+	v = np.clip(c[..., 2], 0.0, 100.0) / 100.0
+	i = np.floor(h6)
+	f = h6 - i
+	i = i.astype(np.intp) % 6
+	p = v * (1.0 - s)
+	q = v * (1.0 - s * f)
+	t = v * (1.0 - s * (1.0 - f))
+	sectors = [i == k for k in range(6)]
+	r = np.select(sectors, [v, q, p, p, t, v])
+	g = np.select(sectors, [t, v, v, q, p, p])
+	b = np.select(sectors, [p, p, t, v, v, q])
+	return _to_byte_batch(np.stack((r, g, b), axis=-1))
@@ -0,0 +1,146 @@
+import colorsys
+import itertools
+
+import numpy as np
+import pytest
+
+import color_models
+from color_models import (
+	_to_byte,
+	hex_to_rgb,
+	hsv_deg_to_rgb255,
+	hsv_deg_to_rgb255_batch,
+	hsv_int_to_rgb255,
+	rgb_to_hex,
+	rgb255_to_hsv_deg,
+	rgb255_to_hsv_deg_batch,
+	rgb255_to_xyz100,
+	rgb255_to_xyz100_batch,
+	xyz100_to_rgb255,
+	xyz100_to_rgb255_batch,
+)
+
+
+def _rgb_grid(step: int) -> np.ndarray:
+	axis = range(0, 256, step)
+	return np.array(list(itertools.product(axis, axis, axis)))
+
+
+def _xyz_grid() -> np.ndarray:
+	# Выходит за 0..100, чтобы захватить и цвета вне охвата sRGB.
+	axis = np.linspace(-5.0, 110.0, 47)
+	return np.array(list(itertools.product(axis, axis, axis)))
+
+
+def test_rgb255_to_hsv_deg_batch_matches_scalar():
+	rgb = np.concatenate((_rgb_grid(3), [(0, 9, 40), (0, 24, 19), (255, 255, 255)]))
+	expected = np.array([rgb255_to_hsv_deg(r, g, b) for r, g, b in rgb.tolist()])
+	np.testing.assert_array_equal(rgb255_to_hsv_deg_batch(rgb), expected)
+
+
+def test_rgb255_to_xyz100_batch_matches_scalar():
+	rgb = _rgb_grid(5)
+	expected = np.array([rgb255_to_xyz100(r, g, b) for r, g, b in rgb.tolist()])
+	np.testing.assert_allclose(rgb255_to_xyz100_batch(rgb), expected, rtol=0.0, atol=1e-12)
+
+
+def test_xyz100_to_rgb255_batch_matches_scalar():
+	xyz = _xyz_grid()
+	expected = [xyz100_to_rgb255(X, Y, Z) for X, Y, Z in xyz.tolist()]
+	rgb, clipped = xyz100_to_rgb255_batch(xyz)
+	assert rgb.dtype == np.uint8
+	np.testing.assert_array_equal(rgb, np.array([e[0] for e in expected]))
+	np.testing.assert_array_equal(clipped, np.array([e[1] for e in expected]))
+
+
+def test_xyz100_to_rgb255_batch_keeps_shape():
+	xyz = _xyz_grid()[:12].reshape(3, 4, 3)
+	rgb, clipped = xyz100_to_rgb255_batch(xyz)
+	assert rgb.shape == (3, 4, 3)
+	assert clipped.shape == (3, 4)
+	for i, j in itertools.product(range(3), range(4)):
+		expected_rgb, expected_clipped = xyz100_to_rgb255(*xyz[i, j].tolist())
+		assert tuple(rgb[i, j].tolist()) == expected_rgb
+		assert bool(clipped[i, j]) == expected_clipped
+
+	rgb, clipped = xyz100_to_rgb255_batch(np.array([41.24, 21.27, 1.93]))
+	assert rgb.shape == (3,)
+	assert clipped.shape == ()
+	assert (tuple(rgb.tolist()), bool(clipped)) == xyz100_to_rgb255(41.24, 21.27, 1.93)
+
+
+def test_hsv_deg_to_rgb255_batch_matches_scalar():
+	hsv = np.array(list(itertools.product(np.arange(0.0, 360.0, 7.0), np.arange(0.0, 101.0, 3.0), np.arange(0.0, 101.0, 3.0))))
+	expected = np.array([hsv_deg_to_rgb255(h, s, v) for h, s, v in hsv.tolist()])
+	np.testing.assert_array_equal(hsv_deg_to_rgb255_batch(hsv), expected)
+
+
+def test_xyz100_to_rgb255_batch_numpy_fallback(monkeypatch):
+	monkeypatch.setattr(color_models, "_encode_rgb255_kernel", lambda: None)
+	xyz = _xyz_grid()
+	expected = [xyz100_to_rgb255(X, Y, Z) for X, Y, Z in xyz.tolist()]
+	rgb, clipped = xyz100_to_rgb255_batch(xyz)
+	np.testing.assert_array_equal(rgb, np.array([e[0] for e in expected]))
+	np.testing.assert_array_equal(clipped, np.array([e[1] for e in expected]))
+
+
+def test_xyz100_to_rgb255_batch_numba_matches_numpy(monkeypatch):
+	pytest.importorskip("numba")
+	assert color_models._encode_rgb255_kernel() is not None
+	xyz = np.random.default_rng(0).uniform(-10.0, 120.0, size=(100_000, 3))
+	rgb_numba, clipped_numba = xyz100_to_rgb255_batch(xyz)
+	monkeypatch.setattr(color_models, "_encode_rgb255_kernel", lambda: None)
+	rgb_numpy, clipped_numpy = xyz100_to_rgb255_batch(xyz)
+	np.testing.assert_array_equal(rgb_numba, rgb_numpy)
+	np.testing.assert_array_equal(clipped_numba, clipped_numpy)
+
+
+def test_rgb255_to_hsv_deg_matches_colorsys():
+	for r, g, b in _rgb_grid(3).tolist() + [[0, 9, 40], [0, 24, 19]]:
+		h, s, v = colorsys.rgb_to_hsv(r / 255.0, g / 255.0, b / 255.0)
+		assert rgb255_to_hsv_deg(r, g, b) == (h * 360.0, s * 100.0, v * 100.0)
+
+
+def test_hsv_deg_to_rgb255_matches_colorsys():
+	checked = 0
+	for h, s, v in itertools.product(range(0, 360, 7), range(0, 101, 3), range(0, 101, 3)):
+		channels = [c * 255.0 for c in colorsys.hsv_to_rgb(h / 360.0, s / 100.0, v / 100.0)]
+		# На ничьих .5 _to_byte округляет вверх, а round — к чётному.
+		if any(abs(c % 1.0 - 0.5) < 1e-9 for c in channels):
+			continue
+		assert hsv_deg_to_rgb255(h, s, v) == tuple(round(c) for c in channels)
+		checked += 1
+	assert checked > 50_000
+
+
+def test_to_byte_rounds_ties_up_and_saturates():
+	assert hsv_int_to_rgb255(0, 0, 70) == (179, 179, 179)  # 178.5 -> 179, а не 178 как у round
+	assert _to_byte(0.5 / 255.0) == 1
+	assert _to_byte(-0.1) == 0
+	assert _to_byte(0.0) == 0
+	assert _to_byte(1.0) == 255
+	assert _to_byte(1.2) == 255
+	assert hsv_int_to_rgb255(0, 0, 0) == (0, 0, 0)
+	assert hsv_int_to_rgb255(0, 0, 100) == (255, 255, 255)
+	assert hsv_int_to_rgb255(0, 100, 100) == (255, 0, 0)
+
+
+def test_rgb255_to_xyz100_rounds_fractional_channels():
+	assert rgb255_to_xyz100(127.9, 0, 0) == rgb255_to_xyz100(128, 0, 0)
+	np.testing.assert_allclose(rgb255_to_xyz100_batch(np.array([127.9, 0.0, 0.0])), rgb255_to_xyz100(128, 0, 0), rtol=0.0, atol=1e-12)
+
+
+def test_rgb_to_hex_clamps_channels():
+	assert rgb_to_hex(-1, 0, 0) == "#000000"
+	assert rgb_to_hex(256, 0, 0) == "#FF0000"
+	assert rgb_to_hex(18, 52, 171) == "#1234AB"
+
+
+def test_hex_to_rgb_rejects_malformed_input():
+	assert hex_to_rgb(" #1234ab ") == (18, 52, 171)
+	assert hex_to_rgb("#12345") == (0, 0, 0)
+	assert hex_to_rgb("#1234567") == (0, 0, 0)
+	with pytest.raises(ValueError):
+		hex_to_rgb("ab  cd")
+	with pytest.raises(ValueError):
+		hex_to_rgb("12345g")
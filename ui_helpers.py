@@ -0,0 +1,90 @@
+import streamlit as st
+from color_models import hex_to_rgb
+
+
+def xyz_to_millis(value):
+	# XYZ задаётся с шагом 0.001, поэтому тысячные доли дают точный целочисленный ключ.
+	return round(value * 1000.0)
+
+
+def millis_to_xyz(millis):
+	return millis / 1000.0
+
+
+def model_inputs(model):
+	# Слайдеры RGB/HSV уже хранят int, поэтому значения берутся без приведения типов.
+	state = st.session_state
+	if model == "rgb":
+		return (state.r, state.g, state.b)
+	if model == "hsv":
+		return (state.h, state.s, state.v)
+	return (xyz_to_millis(state.X), xyz_to_millis(state.Y), xyz_to_millis(state.Z))
+
+
+def _set_source(model):
+	# Значение вернулось к уже синхронизированному — пересчитывать нечего.
+	if st.session_state.get("_last_inputs", {}).get(model) != model_inputs(model):
+		st.session_state.source_model = model
+
+
+def set_source_rgb():
+	_set_source("rgb")
+
+
+def set_source_hsv():
+	_set_source("hsv")
+
+
+def set_source_xyz():
+	_set_source("xyz")
+
+
+def on_hex_change():
+	st.session_state.source_model = "rgb"
+	r, g, b = hex_to_rgb(st.session_state.hex)
+	st.session_state.r = r
+	st.session_state.g = g
+	st.session_state.b = b
+
+
+def _number_input_callback_factory(target_key, after_change):
+	number_key = f"{target_key}_number"
+
+	def _callback():
+		st.session_state[target_key] = st.session_state[number_key]
+		if after_change:
+			after_change()
+
+	return _callback
+
+
+def slider_with_number(label, min_value, max_value, key, on_change, step=None, number_format=None):
+	is_float = isinstance(min_value, float) or isinstance(max_value, float)
+	step_value = step if step is not None else (0.001 if is_float else 1)
+	format_value = number_format if number_format else ("%.3f" if is_float else None)
+	number_key = f"{key}_number"
+	if key in st.session_state:
+		st.session_state[number_key] = st.session_state.get(number_key, st.session_state[key])
+		st.session_state[number_key] = st.session_state[key]
+	else:
+		st.session_state[key] = min_value
+		st.session_state[number_key] = min_value
+	slider_col, input_col = st.columns([4, 1])
+	with slider_col:
+		st.slider(label, min_value, max_value, key=key, on_change=on_change)
+	with input_col:
+		st.number_input(
+			label,
+			min_value=min_value,
+			max_value=max_value,
+			step=step_value,
+			key=number_key,
+			format=format_value,
+			label_visibility="collapsed",
+			on_change=_number_input_callback_factory(key, on_change),
+		)
+
+
+def clamp_round(value: float, min_value: float, max_value: float) -> float:
+	clamped = min(max(float(value), min_value), max_value)
+	return round(clamped, 3)